@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-conv_cuechd.py [-h] [-i INPUT] [-o OUTPUT] [-d {cue,chd,iso,bin}] [-r] [-f | -a] [path]
+conv_cuechd.py [-h] [-i INPUT] [-o OUTPUT] [-d {cue,chd,iso,bin}] [-r] [-f | -a] [-j JOBS] [path]
 
 Convert between CUE/BIN/ISO and CHD images using chdman.
 
@@ -20,6 +20,7 @@ Features:
 - Optional output (-o). If omitted, output name is derived from input basename
 - Directory processing (-d) optional recursive (-r)
 - Force overwrite (-f) or ask before overwrite (-a)
+- Parallel conversion of multiple files (-j)
 - Strict but minimal CUE parsing (MODE1 only)
 """
 
@@ -32,12 +33,16 @@ Examples:
   conv_cuechd.py -d cue discs/ -r -f
   conv_cuechd.py -d chd discs/
 """
+import os
 import platform
 import sys
 import argparse
 import subprocess
 import shutil
 import glob
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
 # ------------------------------------------------------------
@@ -72,6 +77,51 @@ def check_overwrite(path: Path, force: bool, ask: bool):
     return False
 
 
+def is_rotational(dev: int) -> bool:
+    # Linux only: spinning disks report 1 in sysfs, everything else counts as SSD
+    try:
+        sys_dev = Path(f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}").resolve()
+        # partitions have no queue/ of their own, look at the parent disk
+        for d in (sys_dev, sys_dev.parent):
+            rotational = d / "queue" / "rotational"
+            if rotational.exists():
+                return rotational.read_text().strip() == "1"
+    except (AttributeError, OSError):
+        pass
+    return False
+
+
+def default_jobs(inputs: list[Path], limit: int) -> int:
+    # parallel jobs make HDDs seek between files, which is slower than serial
+    devices = set()
+    for inp in inputs:
+        try:
+            devices.add(inp.stat().st_dev)
+        except OSError:
+            pass
+    if any(is_rotational(dev) for dev in devices):
+        return 1
+    return limit
+
+
+def iter_by_ext(root: Path, ext: str, recursive: bool):
+    # os.scandir reuses the file type from readdir, no stat/fnmatch per entry.
+    # normcase keeps glob's matching: case-insensitive on Windows only
+    suffix = f".{ext}"
+    dirs = [root]
+    while dirs:
+        try:
+            with os.scandir(dirs.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            dirs.append(entry.path)
+                    elif os.path.normcase(entry.name).endswith(suffix) and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            pass
+
+
 
 def ask_install_chdman() -> bool:
     while True:
@@ -81,8 +131,14 @@ def ask_install_chdman() -> bool:
         if ans in ("n", "no", ""):
             return False
 
+@lru_cache(maxsize=1)
+def chdman_path() -> str | None:
+    # resolved once, commands use the absolute path so no PATH search per run
+    return shutil.which("chdman")
+
+
 def check_chdman():
-    if shutil.which("chdman"):
+    if chdman_path():
         return True
         
     if not ask_install_chdman():
@@ -121,7 +177,8 @@ def check_chdman():
     except subprocess.CalledProcessError:
         error("Failed to install chdman")
 
-    if not shutil.which("chdman"):
+    chdman_path.cache_clear()
+    if not chdman_path():
         print("chdman installation attempted but still not found in PATH")
         return False
 
@@ -177,14 +234,14 @@ def to_chd(inp: Path, out: Path, force: bool, ask: bool):
     action = "createcd"
     
     if ext == ".iso":
-        if is_udf(path):
+        if is_udf(inp):
             action = "createdvd"
-            warn("ISO is UFD DVD")
-        elif not is_iso9660(path):
+            warn("ISO is UDF DVD")
+        elif not is_iso9660(inp):
             warn("ISO is not 9660")
     
     cmd = [
-        "chdman",
+        chdman_path(),
         action,
         "-i", str(inp),
         "-o", str(out)
@@ -199,7 +256,7 @@ def chd_to_cue(inp: Path, out: Path, force: bool, ask: bool):
         return
 
     cmd = [
-        "chdman",
+        chdman_path(),
         "extractcd",
         "-i", str(inp),
         "-o", str(out)
@@ -212,21 +269,90 @@ def chd_to_cue(inp: Path, out: Path, force: bool, ask: bool):
 # ------------------------------------------------------------
 # Dispatcher
 # ------------------------------------------------------------
-def process_file(inp: Path, output: Path | None, force: bool, ask: bool):
-    ext = inp.suffix.lower()
+def process_chd_source(inp: Path, output: Path | None, force: bool, ask: bool):
+    out = output if output else inp.with_suffix(".chd")
+    to_chd(inp, out, force, ask)
+
+
+def process_chd_target(inp: Path, output: Path | None, force: bool, ask: bool):
+    out = output if output else inp.with_suffix(".cue")
+    chd_to_cue(inp, out, force, ask)
+
 
-    if ext in (".cue", ".iso", ".bin"):
-        out = output if output else inp.with_suffix(".chd")
-        to_chd(inp, out, force, ask)
+# handlers by file type, -d inputs are dispatched directly
+HANDLERS = {
+    "cue": process_chd_source,
+    "iso": process_chd_source,
+    "bin": process_chd_source,
+    "chd": process_chd_target,
+}
 
-    elif ext == ".chd":
-        out = output if output else inp.with_suffix(".cue")
-        chd_to_cue(inp, out, force, ask)
 
+def process_file(inp: Path, output: Path | None, force: bool, ask: bool):
+    handler = HANDLERS.get(inp.suffix[1:].lower())
+
+    if handler:
+        handler(inp, output, force, ask)
     else:
         warn(f"Skipping unsupported file: {inp}")
 
 
+def output_targets(inp: Path, output: Path | None) -> set[Path]:
+    # files written for inp, made absolute so different spellings compare equal
+    if inp.suffix.lower() == ".chd":
+        # extractcd writes the BIN next to the CUE
+        cue_path = output if output else inp.with_suffix(".cue")
+        targets = (cue_path, cue_path.with_suffix(".bin"))
+    else:
+        targets = (output if output else inp.with_suffix(".chd"),)
+    return {Path(os.path.abspath(t)) for t in targets}
+
+
+def pin_worker(slots, jobs: int):
+    # chdman inherits the CPU affinity of the thread starting it, so every
+    # worker gets its own share of cores instead of all chdman threads
+    # competing for all of them
+    if not hasattr(os, "sched_setaffinity"):
+        return
+
+    cpus = sorted(os.sched_getaffinity(0))
+    per_worker, extra = divmod(len(cpus), jobs)
+    if not per_worker:
+        return
+
+    # the first `extra` workers get one CPU more, so no CPU is left unused
+    slot = next(slots)
+    start = slot * per_worker + min(slot, extra)
+    end = start + per_worker + (1 if slot < extra else 0)
+    os.sched_setaffinity(0, cpus[start:end])
+
+
+def process_files(handler, inputs: list[Path], output: Path | None, force: bool, ask: bool, jobs: int):
+    if jobs == 1:
+        for inp in inputs:
+            handler(inp, output, force, ask)
+        return
+
+    # inputs sharing an output (x.cue and x.bin → x.chd) must not run at the
+    # same time, check_overwrite would pass for both. Only the first one goes
+    # to the pool, the others run afterwards in order, just like with -j 1
+    parallel, serial = [], []
+    claimed = set()
+    for inp in inputs:
+        targets = output_targets(inp, output)
+        (serial if targets & claimed else parallel).append(inp)
+        claimed |= targets
+
+    # the work happens in chdman subprocesses, threads are enough;
+    # workers are reused for all files and chdman is only resolved once
+    with ThreadPoolExecutor(max_workers=jobs, initializer=pin_worker,
+                            initargs=(itertools.count(), jobs)) as ex:
+        list(ex.map(partial(handler, output=output, force=force, ask=ask), parallel))
+
+    for inp in serial:
+        handler(inp, output, force, ask)
+
+
 # ------------------------------------------------------------
 # Main
 # ------------------------------------------------------------
@@ -260,6 +386,9 @@ def main():
     overwrite.add_argument("-a", "--ask", action="store_true",
                            help="Ask before overwriting existing files")
 
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="Number of files converted in parallel (default: 1 on HDDs, else CPUs / 4 as chdman is multithreaded itself)")
+
     if len(sys.argv) == 1:
         parser.print_help()
         sys.exit(0)
@@ -273,10 +402,7 @@ def main():
     if args.dir:
         if not args.path:
             error("-d requires a directory path")
-        base = Path(args.path)
-        pattern = f"*.{args.dir}"
-        it = base.rglob(pattern) if args.recursive else base.glob(pattern)
-        inputs.extend(p for p in it if p.is_file())
+        inputs.extend(iter_by_ext(Path(args.path), args.dir, args.recursive))
 
     elif args.recursive:
         error("-r can only be used together with -d")
@@ -296,8 +422,21 @@ def main():
 
     output = Path(args.output) if args.output else None
 
-    for inp in inputs:
-        process_file(inp, output, args.force, args.ask)
+    if args.jobs is not None and args.jobs < 1:
+        error("-j must be at least 1")
+
+    jobs = args.jobs or default_jobs(inputs, max(1, (os.cpu_count() or 1) // 4))
+
+    if args.ask and jobs > 1:
+        # prompts from several worker threads would interleave on one terminal
+        if args.jobs:
+            warn("-a is interactive, converting one file at a time")
+        jobs = 1
+
+    # -d only: every input already has the right extension
+    handler = HANDLERS[args.dir] if args.dir and not args.input else process_file
+
+    process_files(handler, inputs, output, args.force, args.ask, min(jobs, len(inputs)))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-conv_cueiso.py [-h] [-i INPUT] [-o OUTPUT] [-d {iso,cue,bin}] [-r] [-f | -a] [path]
+conv_cueiso.py [-h] [-i INPUT] [-o OUTPUT] [-d {iso,cue,bin}] [-r] [-f | -a] [-j JOBS] [path]
 
 Convert between CUE/BIN and ISO images (data CDs only).
 
@@ -16,6 +16,7 @@ Features:
 - Optional output (-o). If omitted, output name is derived from input basename
 - Directory processing (-d) optional recursive (-r)
 - Force overwrite (-f) or ask before overwrite (-a)
+- Parallel conversion of multiple files (-j)
 - Strict but minimal CUE parsing (MODE1 only)
 """
 
@@ -33,11 +34,43 @@ import os
 import sys
 import argparse
 import glob
+import itertools
+import mmap
+import queue
+import re
+import shutil
+import threading
+from contextlib import suppress
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # optional, pure python sector loop is used instead
+    np = None
+
 SECTOR_2352 = 2352
 SECTOR_2048 = 2048
 DATA_OFFSET_2352 = 16  # MODE1 data starts at byte 16
+SECTORS_PER_CHUNK = 2048  # sectors handled per read/write call
+READ_AHEAD = 4  # chunks read ahead by the reader thread
+IO_BUFFER_SIZE = 4 * 1024 * 1024  # file object buffer for image reads/writes
+
+# FILE "name" ... / TRACK nn MODE, optionally after a UTF-8 BOM
+CUE_LINE = re.compile(
+    rb'^(?:\xef\xbb\xbf)?\s*'
+    rb'(?:FILE\s+"([^"]+)"'
+    rb'|TRACK\s+\d+\s+(\S+))',
+    re.IGNORECASE | re.MULTILINE
+)
+CUE_MODES = {b"MODE1/2352": SECTOR_2352, b"MODE1/2048": SECTOR_2048}
+
+# CUE written by iso_to_bin
+CUE_TEMPLATE = b'''FILE "%b" BINARY
+  TRACK 01 MODE1/2352
+    INDEX 01 00:00:00
+'''
 
 
 # ------------------------------------------------------------
@@ -74,6 +107,51 @@ def check_overwrite(path: Path, force: bool, ask: bool):
     return False
 
 
+def is_rotational(dev: int) -> bool:
+    # Linux only: spinning disks report 1 in sysfs, everything else counts as SSD
+    try:
+        sys_dev = Path(f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}").resolve()
+        # partitions have no queue/ of their own, look at the parent disk
+        for d in (sys_dev, sys_dev.parent):
+            rotational = d / "queue" / "rotational"
+            if rotational.exists():
+                return rotational.read_text().strip() == "1"
+    except (AttributeError, OSError):
+        pass
+    return False
+
+
+def default_jobs(inputs: list[Path], limit: int) -> int:
+    # parallel jobs make HDDs seek between files, which is slower than serial
+    devices = set()
+    for inp in inputs:
+        try:
+            devices.add(inp.stat().st_dev)
+        except OSError:
+            pass
+    if any(is_rotational(dev) for dev in devices):
+        return 1
+    return limit
+
+
+def iter_by_ext(root: Path, ext: str, recursive: bool):
+    # os.scandir reuses the file type from readdir, no stat/fnmatch per entry.
+    # normcase keeps glob's matching: case-insensitive on Windows only
+    suffix = f".{ext}"
+    dirs = [root]
+    while dirs:
+        try:
+            with os.scandir(dirs.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            dirs.append(entry.path)
+                    elif os.path.normcase(entry.name).endswith(suffix) and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            pass
+
+
 # ------------------------------------------------------------
 # CUE parsing (minimal but strict)
 # ------------------------------------------------------------
@@ -81,23 +159,24 @@ def parse_cue(cue_path: Path):
     bin_file = None
     mode = None
 
-    with cue_path.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            line = line.strip().upper()
+    # matched on raw bytes, only the file name is ever decoded
+    data = cue_path.read_bytes()
+
+    for match in CUE_LINE.finditer(data):
+        file_name, track_mode = match.groups()
 
-            if line.startswith("FILE"):
-                bin_file = line.split('"')[1]
+        if file_name:
+            bin_file = file_name.decode("utf-8", errors="ignore")
+            continue
 
-            elif line.startswith("TRACK"):
-                if "AUDIO" in line:
-                    error(f"{cue_path}: audio tracks are not supported")
+        track_mode = track_mode.upper()
 
-                if "MODE1/2352" in line:
-                    mode = SECTOR_2352
-                elif "MODE1/2048" in line:
-                    mode = SECTOR_2048
-                else:
-                    error(f"{cue_path}: unsupported track mode")
+        if track_mode == b"AUDIO":
+            error(f"{cue_path}: audio tracks are not supported")
+
+        mode = CUE_MODES.get(track_mode)
+        if not mode:
+            error(f"{cue_path}: unsupported track mode")
 
     if not bin_file or not mode:
         error(f"{cue_path}: invalid or unsupported CUE file")
@@ -105,6 +184,115 @@ def parse_cue(cue_path: Path):
     return bin_file, mode
 
 
+# ------------------------------------------------------------
+# Sector helpers
+# ------------------------------------------------------------
+def strip_sectors(data: memoryview, out: bytearray) -> memoryview:
+    # 2352 → 2048: keep only the MODE1 payload of every sector.
+    # out is reused between chunks, the used part is returned
+    n_sectors, tail = divmod(len(data), SECTOR_2352)
+    size = SECTOR_2048 * n_sectors
+
+    if np is not None and n_sectors:
+        # one strided copy for the whole chunk, straight into out
+        src = np.frombuffer(data, dtype=np.uint8, count=n_sectors * SECTOR_2352)
+        dst = np.frombuffer(out, dtype=np.uint8, count=size)
+        dst.reshape(n_sectors, SECTOR_2048)[:] = \
+            src.reshape(n_sectors, SECTOR_2352)[:, DATA_OFFSET_2352:DATA_OFFSET_2352 + SECTOR_2048]
+    else:
+        for i in range(n_sectors):
+            src = i * SECTOR_2352 + DATA_OFFSET_2352
+            out[i * SECTOR_2048:(i + 1) * SECTOR_2048] = data[src:src + SECTOR_2048]
+
+    if tail:
+        # truncated last sector, keep whatever payload is there
+        src = n_sectors * SECTOR_2352 + DATA_OFFSET_2352
+        tail_data = data[src:src + SECTOR_2048]
+        out[size:size + len(tail_data)] = tail_data
+        size += len(tail_data)
+
+    return memoryview(out)[:size]
+
+
+def pad_sectors(data: memoryview, out: bytearray) -> memoryview:
+    # 2048 → 2352: place payload at the MODE1 data offset, rest stays zero.
+    # out is reused between chunks, only payload bytes are ever written to it
+    n_sectors, tail = divmod(len(data), SECTOR_2048)
+
+    if np is not None and n_sectors:
+        # one strided copy for the whole chunk
+        src = np.frombuffer(data, dtype=np.uint8, count=n_sectors * SECTOR_2048)
+        dst = np.frombuffer(out, dtype=np.uint8, count=n_sectors * SECTOR_2352)
+        dst.reshape(n_sectors, SECTOR_2352)[:, DATA_OFFSET_2352:DATA_OFFSET_2352 + SECTOR_2048] = \
+            src.reshape(n_sectors, SECTOR_2048)
+    else:
+        for i in range(n_sectors):
+            dst = i * SECTOR_2352 + DATA_OFFSET_2352
+            out[dst:dst + SECTOR_2048] = data[i * SECTOR_2048:(i + 1) * SECTOR_2048]
+
+    if tail:
+        # truncated last sector, zero padded to full size
+        dst = n_sectors * SECTOR_2352 + DATA_OFFSET_2352
+        out[dst:dst + tail] = data[n_sectors * SECTOR_2048:]
+        out[dst + tail:dst + SECTOR_2048] = bytes(SECTOR_2048 - tail)
+
+    return memoryview(out)[:SECTOR_2352 * (n_sectors + (1 if tail else 0))]
+
+
+def read_chunks(f, chunk_size: int):
+    # a reader thread keeps the input queue busy while chunks are converted and written
+    chunks = queue.Queue(maxsize=READ_AHEAD)
+    done = threading.Event()
+
+    def reader():
+        # one buffer being filled, READ_AHEAD queued, one held by the consumer
+        bufs = [bytearray(chunk_size) for _ in range(READ_AHEAD + 2)]
+        try:
+            for buf in itertools.cycle(bufs):
+                if done.is_set():
+                    return
+                nread = f.readinto(buf)
+                chunks.put(memoryview(buf)[:nread])
+                if not nread:
+                    return
+        except Exception as e:
+            chunks.put(e)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            chunk = chunks.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        done.set()
+        while thread.is_alive():
+            # unblock a reader waiting on a full queue
+            with suppress(queue.Empty):
+                chunks.get_nowait()
+            thread.join(0.01)
+
+
+def fadvise(f, advice: str):
+    # page cache hints, only where posix_fadvise exists (not Windows/macOS)
+    if hasattr(os, "posix_fadvise"):
+        with suppress(OSError):
+            os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
+
+
+def drop_cache(src, dst):
+    # the images are read/written once, don't let them push everything
+    # else out of the page cache (only clean pages can be dropped)
+    dst.flush()
+    fadvise(src, "POSIX_FADV_DONTNEED")
+    fadvise(dst, "POSIX_FADV_DONTNEED")
+
+
 # ------------------------------------------------------------
 # Converters
 # ------------------------------------------------------------
@@ -112,16 +300,30 @@ def bin_to_iso(bin_path: Path, iso_path: Path, sector_size: int, force: bool, as
     if not check_overwrite(iso_path, force, ask):
         return
 
-    with bin_path.open("rb") as binf, iso_path.open("wb") as isof:
-        while True:
-            sector = binf.read(sector_size)
-            if not sector:
-                break
+    if sector_size == SECTOR_2048:
+        # nothing to strip, plain copy (sendfile/fcopyfile where available)
+        shutil.copyfile(bin_path, iso_path)
+        print(f"[OK] BIN → ISO: {iso_path}")
+        return
 
-            if sector_size == SECTOR_2352:
-                isof.write(sector[DATA_OFFSET_2352:DATA_OFFSET_2352 + SECTOR_2048])
-            else:
-                isof.write(sector)
+    chunk_size = SECTOR_2352 * SECTORS_PER_CHUNK
+    out = bytearray(SECTOR_2048 * SECTORS_PER_CHUNK)
+
+    with bin_path.open("rb") as binf, iso_path.open("wb", buffering=IO_BUFFER_SIZE) as isof:
+        fadvise(binf, "POSIX_FADV_SEQUENTIAL")
+        fadvise(isof, "POSIX_FADV_SEQUENTIAL")
+
+        size = os.fstat(binf.fileno()).st_size
+        if size:
+            # map the BIN instead of reading it, the page cache is used directly
+            with mmap.mmap(binf.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as mv:
+                    for offset in range(0, size, chunk_size):
+                        isof.write(strip_sectors(mv[offset:offset + chunk_size], out))
+
+        drop_cache(binf, isof)
 
     print(f"[OK] BIN → ISO: {iso_path}")
 
@@ -132,50 +334,93 @@ def iso_to_bin(iso_path: Path, bin_path: Path, force: bool, ask: bool):
     if not check_overwrite(cue_path, force, ask):
         return
 
-    with iso_path.open("rb") as isof, bin_path.open("wb") as binf:
-        while True:
-            data = isof.read(SECTOR_2048)
-            if not data:
-                break
+    out = bytearray(SECTOR_2352 * SECTORS_PER_CHUNK)
 
-            sector = bytearray(SECTOR_2352)
-            sector[DATA_OFFSET_2352:DATA_OFFSET_2352 + SECTOR_2048] = data
-            binf.write(sector)
+    with iso_path.open("rb", buffering=IO_BUFFER_SIZE) as isof, \
+            bin_path.open("wb", buffering=IO_BUFFER_SIZE) as binf:
+        fadvise(isof, "POSIX_FADV_SEQUENTIAL")
+        fadvise(binf, "POSIX_FADV_SEQUENTIAL")
 
-    cue_path.write_text(
-        f'''FILE "{bin_path.name}" BINARY
-  TRACK 01 MODE1/2352
-    INDEX 01 00:00:00
-'''
-    )
+        for chunk in read_chunks(isof, SECTOR_2048 * SECTORS_PER_CHUNK):
+            binf.write(pad_sectors(chunk, out))
+
+        drop_cache(isof, binf)
+
+    cue_path.write_bytes(CUE_TEMPLATE % bin_path.name.encode("utf-8"))
 
     print(f"[OK] ISO → BIN+CUE: {bin_path}, {cue_path}")
 
 # ------------------------------------------------------------
 # Dispatcher
 # ------------------------------------------------------------
-def process_file(inp: Path, output: Path | None, force: bool, ask: bool):
-    ext = inp.suffix.lower()
+def process_cue(inp: Path, output: Path | None, force: bool, ask: bool):
+    bin_name, sector_size = parse_cue(inp)
+    bin_path = inp.parent / bin_name
+    iso_path = output if output else inp.with_suffix(".iso")
+    bin_to_iso(bin_path, iso_path, sector_size, force, ask)
 
-    if ext == ".cue":
-        bin_name, sector_size = parse_cue(inp)
-        bin_path = inp.parent / bin_name
-        iso_path = output if output else inp.with_suffix(".iso")
-        bin_to_iso(bin_path, iso_path, sector_size, force, ask)
 
-    elif ext == ".iso":
-        bin_path = output if output else inp.with_suffix(".bin")
-        iso_to_bin(inp, bin_path, force, ask)
+def process_iso(inp: Path, output: Path | None, force: bool, ask: bool):
+    bin_path = output if output else inp.with_suffix(".bin")
+    iso_to_bin(inp, bin_path, force, ask)
+
+
+def process_bin(inp: Path, output: Path | None, force: bool, ask: bool):
+    # BIN is accepted silently but converted to ISO
+    iso_path = output if output else inp.with_suffix(".iso")
+    bin_to_iso(inp, iso_path, SECTOR_2352, force, ask)
 
-    elif ext == ".bin":
-        # BIN is accepted silently but converted to ISO
-        iso_path = output if output else inp.with_suffix(".iso")
-        bin_to_iso(inp, iso_path, SECTOR_2352, force, ask)
 
+# handlers by file type, -d inputs are dispatched directly
+HANDLERS = {
+    "cue": process_cue,
+    "iso": process_iso,
+    "bin": process_bin,
+}
+
+
+def process_file(inp: Path, output: Path | None, force: bool, ask: bool):
+    handler = HANDLERS.get(inp.suffix[1:].lower())
+
+    if handler:
+        handler(inp, output, force, ask)
     else:
         warn(f"Skipping unsupported file: {inp}")
 
 
+def output_targets(inp: Path, output: Path | None) -> set[Path]:
+    # files written for inp, made absolute so different spellings compare equal
+    if inp.suffix.lower() == ".iso":
+        bin_path = output if output else inp.with_suffix(".bin")
+        targets = (bin_path, bin_path.with_suffix(".cue"))
+    else:
+        targets = (output if output else inp.with_suffix(".iso"),)
+    return {Path(os.path.abspath(t)) for t in targets}
+
+
+def process_files(handler, inputs: list[Path], output: Path | None, force: bool, ask: bool, jobs: int):
+    if jobs == 1:
+        for inp in inputs:
+            handler(inp, output, force, ask)
+        return
+
+    # inputs sharing an output (x.cue and x.bin → x.iso) must not run at the
+    # same time, check_overwrite would pass for both. Only the first one goes
+    # to the pool, the others run afterwards in order, just like with -j 1
+    parallel, serial = [], []
+    claimed = set()
+    for inp in inputs:
+        targets = output_targets(inp, output)
+        (serial if targets & claimed else parallel).append(inp)
+        claimed |= targets
+
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        list(ex.map(partial(handler, output=output, force=force, ask=ask), parallel))
+
+    for inp in serial:
+        handler(inp, output, force, ask)
+
+
 # ------------------------------------------------------------
 # Main
 # ------------------------------------------------------------
@@ -208,6 +453,9 @@ def main():
     overwrite.add_argument("-a", "--ask", action="store_true",
                            help="Ask before overwriting existing files")
 
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="Number of files converted in parallel (default: 1 on HDDs, else up to 4)")
+
     if len(sys.argv) == 1:
         parser.print_help()
         sys.exit(0)
@@ -219,11 +467,7 @@ def main():
     if args.dir:
         if not args.path:
             error("-d requires a directory path")
-        if args.recursive:
-            it = Path(args.path).rglob(f"*.{args.dir}")
-        else:
-            it = Path(args.path).glob(f"*.{args.dir}")
-        inputs.extend(p for p in it if p.is_file())
+        inputs.extend(iter_by_ext(Path(args.path), args.dir, args.recursive))
 
     elif args.recursive:
         error("-r can only be used together with -d")
@@ -245,8 +489,21 @@ def main():
 
     output = Path(args.output) if args.output else None
 
-    for inp in inputs:
-        process_file(inp, output, args.force, args.ask)
+    if args.jobs is not None and args.jobs < 1:
+        error("-j must be at least 1")
+
+    jobs = args.jobs or default_jobs(inputs, min(os.cpu_count() or 1, 4))
+
+    if args.ask and jobs > 1:
+        # overwrite prompts can't be answered from worker processes
+        if args.jobs:
+            warn("-a is interactive, converting one file at a time")
+        jobs = 1
+
+    # -d only: every input already has the right extension
+    handler = HANDLERS[args.dir] if args.dir and not args.input else process_file
+
+    process_files(handler, inputs, output, args.force, args.ask, min(jobs, len(inputs)))
 
 
 if __name__ == "__main__":